@@ -1,103 +1,46 @@
-from queue import Queue
+import sys
+from bisect import bisect_left
+from collections import deque
 
+import numpy as np
 
-class Process:
-    """
-    Each Process has a list of burst times, and a list of I/O times.
-    idx_burst and idx_io are the indices of the current burst and I/O time in the lists
-    waiting_time is the total time the process has spent waiting
-    turnaround_time is the total time the process has spent running
-    response_time is the time the process first started running
-    mode is one of 'ready', 'burst', 'io', or 'done':
-        - 'ready' means the process is waiting to be scheduled on the CPU
-        - 'burst' means the process is currently running on the CPU
-        - 'io' means the process is currently waiting for I/O
-        - 'done' means the process has finished running
-    """
-
-    def __init__(self, id, times, sched):
-        self.id = id
-        self.n = len(times)
-        self.burst_times = times[::2]
-        self.io_times = times[1::2]
-        self.mode = 'ready'
-        self.scheduler = sched
-        self.idx_burst = 0
-        self.idx_io = 0
-
-        self.waiting_time = 0
-        self.turnaround_time = 0
-        self.response_time = None
-
-    """
-    This function simulates the process running on the CPU for a single time unit.
-    It returns True if the process is done running, and False otherwise.
-    """
-
-    def simulate(self):
-        if self.mode == 'done':
-            return True
-
-        self.turnaround_time += 1
-        if self.mode == 'burst':
-            self.burst_times[self.idx_burst] -= 1
-            if self.burst_times[self.idx_burst] == 0:
-                self.mode = 'io'
-                self.idx_burst += 1
-                if self.idx_burst == self.n // 2 + 1:
-                    self.mode = 'done'
-                    self.scheduler.processDone(self.id)
-                    return True
-                else:
-                    self.scheduler.processIO(self.id)
-
-        elif self.mode == 'io':
-            self.io_times[self.idx_io] -= 1
-            if self.io_times[self.idx_io] == 0:
-                self.mode = 'ready'
-                self.idx_io += 1
-                self.scheduler.processReady(self.id)
-        elif self.mode == 'ready':
-            self.waiting_time += 1
-
-        return False
-
-    """
-    This function updates the mode of the process to 'ready'.
-    """
-
-    def scheduleOnCPU(self):
-        assert (self.mode == 'ready')
-        self.mode = 'burst'
-        if self.response_time == None:
-            self.response_time = self.turnaround_time
-
-    """
-    This function updates the mode of the process to 'ready'.
-    """
-
-    def descheduleFromCPU(self):
-        assert (self.mode == 'burst')
-        self.mode = 'ready'
+from state import NO_LIMIT, READY, Process, ProcessState
 
 
 class RRQueue:
     """
     This class implements the RR Queue for MLFQ scheduler.
+    queue holds the ids of its processes and mode is the mode list of their ProcessState.
     isActive is a boolean variable that indicates whether the queue is active or not.
     Being active means that some process from the queue is currently running on the CPU.
     If isActive is False, then the queue is not active and the currentRunning process is None.
     Otherwise, the currentRunning process is the process that is currently running on the CPU.
-    """
-
-    def __init__(self, queue, quantum, isActive):
+    Every process gets a sequence number when it joins the queue, so seqs is sorted and
+    follows the queue order, and seqOf maps each id in the queue to its sequence number.
+    ready holds the sorted sequence numbers of processes that may be ready; entries of
+    processes that have since left the READY mode are dropped lazily when
+    nextReadyProcess comes across them.
+    These four structures (queue, seqs, seqOf and ready) must be kept in step: queue and
+    seqs are parallel lists, and the scheduler must call markReady whenever one of the
+    processes becomes ready, or nextReadyProcess will never find it.
+    Finding the next ready process is an O(log n) bisect of ready and seqs, plus one
+    step per stale entry dropped. Adding to ready (markReady) and deleting from queue,
+    seqs or ready (removeCurrent) are list inserts and deletes, O(n) each, not O(1).
+    """
+
+    def __init__(self, queue, quantum, isActive, mode):
         self.quantum = quantum
-        self.queue = queue
+        self.queue = list(queue)  # own copy, processes are deleted from it in place
+        self.mode = mode
+        self.seqs = list(range(len(self.queue)))
+        self.seqOf = {id: i for i, id in enumerate(self.queue)}
+        self.nextSeq = len(self.queue)
+        self.ready = [i for i, id in enumerate(self.queue) if mode[id] == READY]
         self.time = 0  # time elapsed on the current burst
         self.idx = 0
         self.isActive = isActive
         self.lastRemoved = None
-        self.currentRunning = self.queue[0].id if len(self.queue) > 0 and self.isActive else None
+        self.currentRunning = self.queue[0] if len(self.queue) > 0 and self.isActive else None
 
     """
     This function goes over the queue in a round-robin fashion and
@@ -110,18 +53,46 @@ class RRQueue:
     def nextReadyProcess(self):
         if not self.isActive:
             return
-        cnt = 0
         assert (len(self.queue) > 0)
-        while self.queue[self.idx].mode != 'ready':
-            self.idx = (self.idx + 1) % len(self.queue)
-            cnt += 1
-            if cnt == len(self.queue):  # all processes are waiting
-                self.isActive = False
-                self.currentRunning = None
+        start = self.seqs[self.idx]
+        while self.ready:
+            i = bisect_left(self.ready, start)
+            if i == len(self.ready):  # wrap around to the front of the queue
+                i = 0
+            idx = bisect_left(self.seqs, self.ready[i])
+            if self.mode[self.queue[idx]] == READY:
+                self.idx = idx
+                self.isActive = True
+                self.currentRunning = self.queue[idx]
                 return
+            del self.ready[i]  # stale entry
 
-        self.isActive = True
-        self.currentRunning = self.queue[self.idx].id
+        # all processes are waiting
+        self.isActive = False
+        self.currentRunning = None
+
+    """
+    Records that the process with the given id has become ready.
+    """
+
+    def markReady(self, id):
+        seq = self.seqOf[id]
+        i = bisect_left(self.ready, seq)
+        if i == len(self.ready) or self.ready[i] != seq:
+            self.ready.insert(i, seq)
+
+    """
+    Deletes the process at idx from the queue (it finished or its quantum expired).
+    """
+
+    def removeCurrent(self):
+        seq = self.seqs[self.idx]
+        del self.seqOf[self.queue[self.idx]]
+        del self.queue[self.idx]
+        del self.seqs[self.idx]
+        i = bisect_left(self.ready, seq)
+        if i < len(self.ready) and self.ready[i] == seq:
+            del self.ready[i]
 
     """
     This function is called when the process currently running on the CPU
@@ -143,7 +114,7 @@ class RRQueue:
     def processDone(self, id):
         assert (self.currentRunning == id)
         self.time = 0
-        self.queue = self.queue[:self.idx] + self.queue[self.idx + 1:]
+        self.removeCurrent()
         if self.idx == len(self.queue):
             self.idx = 0
 
@@ -175,11 +146,34 @@ class RRQueue:
         return self.isActive
 
     """
-    Add a new process to the current queue.
+    Add a new (ready) process to the current queue.
+    """
+
+    def addProcess(self, id):
+        seq = self.nextSeq
+        self.nextSeq += 1
+        self.queue.append(id)
+        self.seqs.append(seq)
+        self.seqOf[id] = seq
+        self.ready.append(seq)
+
+    """
+    Returns the time left before the quantum expires, or None if the queue is not active.
+    """
+
+    def timeLeft(self):
+        if not self.isActive:
+            return None
+        return self.quantum - self.time
+
+    """
+    Advances the quantum clock by dt time units. The caller guarantees the quantum
+    does not expire within them (dt is less than timeLeft), so no process is removed.
     """
 
-    def addProcess(self, proc):
-        self.queue.append(proc)
+    def advance(self, dt):
+        if self.isActive:
+            self.time += dt
 
     """
     This simulates one time unit for the current queue. If the quantum is expired,
@@ -196,9 +190,9 @@ class RRQueue:
         self.time += 1
         if self.time == self.quantum:  # quantum expired
             self.time = 0
-            self.lastRemoved = self.queue[self.idx].id
+            self.lastRemoved = self.queue[self.idx]
             # Removing the process from the queue
-            self.queue = self.queue[:self.idx] + self.queue[self.idx + 1:]
+            self.removeCurrent()
             if self.idx == len(self.queue):
                 self.idx = 0
 
@@ -219,19 +213,24 @@ class RRQueue:
 
 class MLFQScheduler:
     """
-    MLFQ scheduler maintains three queues of processes - first two work in round-robin fashion
-    and the last is a FCFS queue.
-    """
-
-    def __init__(self, processes):
-        assert (len(processes) > 0)
-        self.processes = processes
-        self.n = len(processes)
-        self.rr_queues = [RRQueue(processes, 5, True), RRQueue([], 10, False)]
-        self.fcfs_queue = Queue()
-        self.priorities = [0] * self.n  # priorities of processes (0 -> highest, 2 -> lowest)
-        self.cpu = processes[0].id
-        self.processes[self.cpu].scheduleOnCPU()
+    MLFQ scheduler maintains one round-robin queue per quantum in quantums (by default
+    two, with quantums 5 and 10) and a last FCFS queue.
+    Queue i holds the processes of priority i; the FCFS queue has the lowest priority.
+    """
+
+    def __init__(self, state, quantums=(5, 10)):
+        assert (state.n > 0)
+        self.state = state
+        self.processes = [Process(i, state) for i in range(state.n)]  # views used by printStats
+        self.n = state.n
+        self.rr_queues = [RRQueue(range(self.n) if i == 0 else [], quantum, i == 0, state.mode)
+                          for i, quantum in enumerate(quantums)]
+        self.fcfs_queue = deque()
+        self.fcfs_priority = len(self.rr_queues)
+        # priorities of processes (0 -> highest, fcfs_priority -> lowest)
+        self.priorities = np.zeros(self.n, dtype=np.int8)
+        self.cpu = 0  # id of the process currently running on the CPU (-1 when idle)
+        state.scheduleOnCPU(self.cpu)
         self.total_time = 0
         self.cpu_time = 0
         self.done = 0  # No of processes done
@@ -241,9 +240,11 @@ class MLFQScheduler:
     """
 
     def processReady(self, id):
-        if self.priorities[id] == 2:
-            self.fcfs_queue.put(id)
-        # If the priority is 0 or 1, then the process is already in the RR queue
+        if self.priorities[id] == self.fcfs_priority:
+            self.fcfs_queue.append(id)
+        else:
+            # The process is already in the RR queue, it only needs to know it is ready
+            self.rr_queues[self.priorities[id]].markReady(id)
 
     """
     Called by a running process when it is finished. 
@@ -252,10 +253,10 @@ class MLFQScheduler:
     def processDone(self, id):
         assert (self.cpu == id)
         self.done += 1
-        self.cpu = None
+        self.cpu = -1
 
         # Call processDone on the RR queue
-        if self.priorities[id] < 2:
+        if self.priorities[id] < self.fcfs_priority:
             self.rr_queues[self.priorities[id]].processDone(id)
 
     """
@@ -264,14 +265,26 @@ class MLFQScheduler:
 
     def processIO(self, id):
         assert (self.cpu == id)
-        self.cpu = None
+        self.cpu = -1
 
         # Call processIO on the RR queue
-        if self.priorities[id] < 2:
+        if self.priorities[id] < self.fcfs_priority:
             self.rr_queues[self.priorities[id]].processIO(id)
 
     """
-    Simulates the scheduler for a single time unit.
+    Returns the number of time units until the quantum of an active RR queue expires,
+    or NO_LIMIT if no RR queue is active. Bursts and I/Os are accounted for by tick.
+    """
+
+    def nextQuantumExpiry(self):
+        limit = NO_LIMIT
+        for q in self.rr_queues:
+            if q.isActive:
+                limit = min(limit, q.timeLeft())
+        return limit
+
+    """
+    Simulates the scheduler up to the next event.
     Updates the total time and CPU time.
     Returns True if all processes are done, and False otherwise.
     """
@@ -280,61 +293,58 @@ class MLFQScheduler:
         if self.done == self.n:
             return True
 
-        # If the CPU is free or running process is not of highest priority,
-        # try to schedule a process from the highest priority queue
-        if self.cpu == None or self.priorities[self.cpu] > 0:
-            if self.rr_queues[0].makeActive():  # If the queue becomes active
-                if self.cpu is not None:  # If the CPU was running a process, deschedule it
-                    self.processes[self.cpu].descheduleFromCPU()
-                    if self.priorities[self.cpu] == 1:
-                        self.rr_queues[1].makeInactive()
-                    else:
-                        self.fcfs_queue.put(self.cpu)
-
-                # Schedule the process from the queue on the CPU
-                self.cpu = self.rr_queues[0].getCurrentRunningProcess()
-                self.processes[self.cpu].scheduleOnCPU()
-
-        # If the CPU is free or running process is not of second highest priority,
-        # try to schedule a process from the second highest priority queue
-        if self.cpu == None or self.priorities[self.cpu] > 1:
-            if self.rr_queues[1].makeActive():
-                if self.cpu is not None:
-                    self.processes[self.cpu].descheduleFromCPU()
-                    self.fcfs_queue.put(self.cpu)
-                self.cpu = self.rr_queues[1].getCurrentRunningProcess()
-                self.processes[self.cpu].scheduleOnCPU()
+        priorities = self.priorities
+        state = self.state
+
+        # If the CPU is free or the running process has a lower priority,
+        # try to schedule a process from each RR queue in order of priority
+        for prio, q in enumerate(self.rr_queues):
+            if self.cpu == -1 or priorities[self.cpu] > prio:
+                if q.makeActive():  # If the queue becomes active
+                    if self.cpu >= 0:  # If the CPU was running a process, deschedule it
+                        state.descheduleFromCPU(self.cpu)
+                        if priorities[self.cpu] < self.fcfs_priority:
+                            self.rr_queues[priorities[self.cpu]].makeInactive()
+                            self.rr_queues[priorities[self.cpu]].markReady(self.cpu)
+                        else:
+                            self.fcfs_queue.append(self.cpu)
+
+                    # Schedule the process from the queue on the CPU
+                    self.cpu = q.getCurrentRunningProcess()
+                    state.scheduleOnCPU(self.cpu)
 
         # If the CPU is still free, try to schedule a process from the lowest priority queue
-        if self.cpu == None:
-            if not self.fcfs_queue.empty():
-                self.cpu = self.fcfs_queue.get()
-                self.processes[self.cpu].scheduleOnCPU()
+        if self.cpu == -1:
+            if self.fcfs_queue:
+                self.cpu = self.fcfs_queue.popleft()
+                state.scheduleOnCPU(self.cpu)
 
-        if self.cpu != None:
-            self.cpu_time += 1
+        # Jump to the next event: a burst or I/O finishing, or a quantum expiring
+        dt, count = state.advance(self.nextQuantumExpiry())
+        if self.cpu >= 0:
+            self.cpu_time += dt
 
-        self.total_time += 1
+        self.total_time += dt
 
-        for p in self.processes:
-            p.simulate()
+        # The quantum clocks run up to the time unit on which the event fires;
+        # that last unit is simulated below, after the processes have reacted to it
+        for q in self.rr_queues:
+            q.advance(dt - 1)
+
+        state.update(self, count)
 
         # Simulate the RR queues
-        if not self.rr_queues[0].simulate():
-            # If the quantum expired, move the process to the next queue and deschedule it
-            removed = self.rr_queues[0].getLastRemoved()
-            self.priorities[removed] += 1
-            self.rr_queues[1].addProcess(self.processes[removed])
-            self.processes[removed].descheduleFromCPU()
-            self.cpu = None
-
-        if not self.rr_queues[1].simulate():
-            # If the quantum expired, move the process to the next queue and deschedule it
-            removed = self.rr_queues[1].getLastRemoved()
-            self.priorities[removed] += 1
-            self.fcfs_queue.put(removed)
-            self.processes[removed].descheduleFromCPU()
-            self.cpu = None
+        for prio, q in enumerate(self.rr_queues):
+            if not q.simulate():
+                # If the quantum expired, move the process to the next queue and deschedule it
+                removed = q.getLastRemoved()
+                priorities[removed] += 1
+                state.descheduleFromCPU(removed)
+                if prio + 1 < self.fcfs_priority:
+                    self.rr_queues[prio + 1].addProcess(removed)
+                else:
+                    self.fcfs_queue.append(removed)
+                self.cpu = -1
 
         return self.done == self.n
 
@@ -343,18 +353,16 @@ class MLFQScheduler:
     """
 
     def printStats(self):
-        print("Scheduler: MLFQ")
-        print("CPU Utilization: %.2f%%" % (self.cpu_time / self.total_time * 100.0))
+        lines = ["Scheduler: MLFQ"]
+        lines.append("CPU Utilization: %.2f%%" % (self.cpu_time / self.total_time * 100.0))
 
-        print("\tTw\tTtr\tTr")
-        for p in self.processes:
-            print(f"P{p.id + 1}\t{p.waiting_time}\t{p.turnaround_time}\t{p.response_time}")
+        lines.append("\tTw\tTtr\tTr")
+        lines += [f"P{p.id + 1}\t{p.waiting_time}\t{p.turnaround_time}\t{p.response_time}" for p in self.processes]
 
-        waiting_times = [p.waiting_time for p in self.processes]
-        turnaround_times = [p.turnaround_time for p in self.processes]
-        response_times = [p.response_time for p in self.processes]
-        print(
-            f"Avg\t{sum(waiting_times) / self.n:.2f}\t{sum(turnaround_times) / self.n:.2f}\t{sum(response_times) / self.n:.2f}")
+        s = self.state
+        lines.append(f"Avg\t{np.mean(s.waiting_time):.2f}\t{np.mean(s.turnaround_time):.2f}\t{np.mean(s.response_time):.2f}")
+        # One write for the whole report instead of a print per line
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -368,14 +376,11 @@ def main():
         [14, 46, 17, 41, 11, 42, 15, 21, 4, 32, 7, 19, 16, 33, 10],
         [4, 14, 5, 33, 6, 51, 14, 73, 16, 87, 6]
     ]
-    n = len(process_times)
-    processes = [Process(i, process_times[i], None) for i in range(n)]
-
-    scheduler = MLFQScheduler(processes)
-    for p in processes:
-        p.scheduler = scheduler
+    state = ProcessState(process_times)
+    scheduler = MLFQScheduler(state)
 
-    while not scheduler.simulate():
+    step = scheduler.simulate
+    while not step():
         pass
 
     scheduler.printStats()
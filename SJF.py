@@ -1,5 +1,7 @@
 from queue import PriorityQueue
 
+from state import BURST, DONE, IO, READY
+
 
 class Process:
     """
@@ -8,19 +10,20 @@ class Process:
     waiting_time is the total time the process has spent waiting
     turnaround_time is the total time the process has spent running
     response_time is the time the process first started running
-    mode is one of 'ready', 'burst', 'io', or 'done':
-        - 'ready' means the process is waiting to be scheduled on the CPU
-        - 'burst' means the process is currently running on the CPU
-        - 'io' means the process is currently waiting for I/O
-        - 'done' means the process has finished running
+    mode is one of READY, BURST, IO or DONE:
+        - READY means the process is waiting to be scheduled on the CPU
+        - BURST means the process is currently running on the CPU
+        - IO means the process is currently waiting for I/O
+        - DONE means the process has finished running
     """
 
     def __init__(self, id, times, sched):
         self.id = id
-        self.n = len(times)
         self.burst_times = times[::2]
         self.io_times = times[1::2]
-        self.mode = 'ready'
+        self.num_bursts = len(self.burst_times)
+        self.remaining = self.burst_times[0]  # time left in the current burst or I/O
+        self.mode = READY
         self.scheduler = sched
         self.idx_burst = 0
         self.idx_io = 0
@@ -35,29 +38,32 @@ class Process:
     """
 
     def simulate(self):
-        if self.mode == 'done':
+        mode = self.mode
+        if mode == DONE:
             return True
 
         self.turnaround_time += 1
-        if self.mode == 'burst':
-            self.burst_times[self.idx_burst] -= 1
-            if self.burst_times[self.idx_burst] == 0:
-                self.mode = 'io'
+        if mode == BURST:
+            self.remaining -= 1
+            if self.remaining == 0:
+                self.mode = IO
                 self.idx_burst += 1
-                if self.idx_burst == self.n // 2 + 1:
-                    self.mode = 'done'
+                if self.idx_burst == self.num_bursts:
+                    self.mode = DONE
                     self.scheduler.processDone(self.id)
                     return True
                 else:
+                    self.remaining = self.io_times[self.idx_io]
                     self.scheduler.processIO(self.id)
 
-        elif self.mode == 'io':
-            self.io_times[self.idx_io] -= 1
-            if self.io_times[self.idx_io] == 0:
-                self.mode = 'ready'
+        elif mode == IO:
+            self.remaining -= 1
+            if self.remaining == 0:
+                self.mode = READY
                 self.idx_io += 1
+                self.remaining = self.burst_times[self.idx_burst]
                 self.scheduler.processReady(self.id)
-        elif self.mode == 'ready':
+        elif mode == READY:
             self.waiting_time += 1
 
         return False
@@ -67,8 +73,8 @@ class Process:
     """
 
     def scheduleOnCPU(self):
-        assert (self.mode == 'ready')
-        self.mode = 'burst'
+        assert (self.mode == READY)
+        self.mode = BURST
         if self.response_time == None:
             self.response_time = self.turnaround_time
 
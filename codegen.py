@@ -0,0 +1,132 @@
+import time
+from collections import deque
+
+from FCFS import FCFSScheduler
+from state import BURST, DONE, IO, READY, ProcessState
+
+"""
+Generates the source of a run() function that simulates FCFS scheduling of the given
+processes. The simulation is the same event-by-event one as FCFSScheduler.simulate, but
+every process gets its own local variables (mode m, remaining time r, phase p, waiting
+time w, turnaround time t and response time s) and its burst and I/O times are written
+into the code as constants, so the phase changes are straight-line if cascades.
+run() returns (cpu_time, total_time, waiting_times, turnaround_times, response_times).
+"""
+
+
+def generateFCFS(process_times):
+    n = len(process_times)
+    ids = range(n)
+    lines = ["def run():"]
+
+    def emit(depth, line):
+        lines.append("    " * depth + line)
+
+    emit(1, f"queue = deque({list(range(1, n))})")
+    emit(1, "cpu = 0")
+    emit(1, "done = 0")
+    emit(1, "cpu_time = 0")
+    emit(1, "total_time = 0")
+    for i in ids:
+        mode = BURST if i == 0 else READY
+        emit(1, f"m{i} = {mode}; r{i} = {process_times[i][0]}; p{i} = 0; w{i} = 0; t{i} = 0; s{i} = {0 if i == 0 else -1}")
+
+    emit(1, f"while done < {n}:")
+
+    # Schedule the next process in the queue if the CPU is idle
+    emit(2, "if cpu < 0 and queue:")
+    emit(3, "cpu = queue.popleft()")
+    for i in ids:
+        emit(3, f"{'if' if i == 0 else 'elif'} cpu == {i}:")
+        emit(4, f"m{i} = {BURST}")
+        emit(4, f"if s{i} < 0: s{i} = t{i}")
+
+    # Time to the next event
+    emit(2, "dt = None")
+    for i in ids:
+        emit(2, f"if (m{i} == {BURST} or m{i} == {IO}) and (dt is None or r{i} < dt): dt = r{i}")
+    emit(2, "if cpu >= 0: cpu_time += dt")
+    emit(2, "total_time += dt")
+
+    # Accounting
+    for i in ids:
+        emit(2, f"if m{i} == {READY}: w{i} += dt; t{i} += dt")
+        emit(2, f"elif m{i} != {DONE}: r{i} -= dt; t{i} += dt")
+
+    # Mode changes, in order of id
+    for i, times in enumerate(process_times):
+        emit(2, f"if (m{i} == {BURST} or m{i} == {IO}) and r{i} == 0:")
+        for phase in range(len(times)):
+            emit(3, f"{'if' if phase == 0 else 'elif'} p{i} == {phase}:")
+            if phase == len(times) - 1:  # last burst
+                emit(4, f"m{i} = {DONE}; done += 1; cpu = -1")
+            elif phase % 2 == 0:  # burst, then I/O
+                emit(4, f"m{i} = {IO}; r{i} = {times[phase + 1]}; p{i} = {phase + 1}; cpu = -1")
+            else:  # I/O, then ready for the next burst
+                emit(4, f"m{i} = {READY}; r{i} = {times[phase + 1]}; p{i} = {phase + 1}; queue.append({i})")
+
+    emit(1, "return (cpu_time, total_time, "
+            f"[{', '.join(f'w{i}' for i in ids)}], "
+            f"[{', '.join(f't{i}' for i in ids)}], "
+            f"[{', '.join(f's{i}' for i in ids)}])")
+    return "\n".join(lines) + "\n"
+
+
+"""
+Compiles the source from generateFCFS and returns the run() function.
+"""
+
+
+def compileFCFS(process_times):
+    namespace = {"deque": deque}
+    exec(compile(generateFCFS(process_times), "<fcfs-codegen>", "exec"), namespace)
+    return namespace["run"]
+
+
+"""
+Benchmarks the generated simulator against FCFSScheduler on the same processes and
+checks that both produce the same stats.
+"""
+
+
+def main():
+    process_times = [
+        [5, 27, 3, 31, 5, 43, 4, 18, 6, 22, 4, 26, 3, 24, 4],
+        [4, 48, 5, 44, 7, 42, 12, 37, 9, 76, 4, 41, 9, 31, 7, 43, 8],
+        [8, 33, 12, 41, 18, 65, 14, 21, 4, 61, 15, 18, 14, 26, 5, 31, 6],
+        [3, 35, 4, 41, 5, 45, 3, 51, 4, 61, 5, 54, 6, 82, 5, 77, 3],
+        [16, 24, 17, 21, 5, 36, 16, 26, 7, 31, 13, 28, 11, 21, 6, 13, 3, 11, 4],
+        [11, 22, 4, 8, 5, 10, 6, 12, 7, 14, 9, 18, 12, 24, 15, 30, 8],
+        [14, 46, 17, 41, 11, 42, 15, 21, 4, 32, 7, 19, 16, 33, 10],
+        [4, 14, 5, 33, 6, 51, 14, 73, 16, 87, 6]
+    ]
+    runs = 1000
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        state = ProcessState(process_times)
+        scheduler = FCFSScheduler(state)
+        step = scheduler.simulate
+        while not step():
+            pass
+    scheduler_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    run = compileFCFS(process_times)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = run()
+    generated_time = time.perf_counter() - start
+
+    expected = (scheduler.cpu_time, scheduler.total_time, list(state.waiting_time),
+                list(state.turnaround_time), list(state.response_time))
+    assert (result == expected)
+
+    print(f"FCFSScheduler:       {scheduler_time / runs * 1e6:.1f} us/run")
+    print(f"Generated simulator: {generated_time / runs * 1e6:.1f} us/run (compiled in {compile_time * 1e3:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
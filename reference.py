@@ -0,0 +1,365 @@
+import importlib.util
+import random
+import sys
+from collections import deque
+
+import FCFS
+import MLFQ
+from state import BURST, DONE, IO, READY, ProcessState
+
+
+class Process:
+    """
+    A process simulated one time unit at a time, as the schedulers originally did.
+    Same fields as in ProcessState, with burst_times and io_times counted down in place.
+    """
+
+    def __init__(self, id, times, sched):
+        self.id = id
+        self.burst_times = list(times[::2])
+        self.io_times = list(times[1::2])
+        self.mode = READY
+        self.scheduler = sched
+        self.idx_burst = 0
+        self.idx_io = 0
+
+        self.waiting_time = 0
+        self.turnaround_time = 0
+        self.response_time = -1
+
+    """
+    This function simulates the process for a single time unit.
+    """
+
+    def simulate(self):
+        if self.mode == DONE:
+            return
+
+        self.turnaround_time += 1
+        if self.mode == BURST:
+            self.burst_times[self.idx_burst] -= 1
+            if self.burst_times[self.idx_burst] == 0:
+                self.idx_burst += 1
+                if self.idx_burst == len(self.burst_times):
+                    self.mode = DONE
+                    self.scheduler.processDone(self.id)
+                else:
+                    self.mode = IO
+                    self.scheduler.processIO(self.id)
+        elif self.mode == IO:
+            self.io_times[self.idx_io] -= 1
+            if self.io_times[self.idx_io] == 0:
+                self.mode = READY
+                self.idx_io += 1
+                self.scheduler.processReady(self.id)
+        else:
+            self.waiting_time += 1
+
+    def scheduleOnCPU(self):
+        assert (self.mode == READY)
+        self.mode = BURST
+        if self.response_time < 0:
+            self.response_time = self.turnaround_time
+
+    def descheduleFromCPU(self):
+        assert (self.mode == BURST)
+        self.mode = READY
+
+
+class FCFSScheduler:
+    """
+    FCFS scheduler simulated one time unit at a time.
+    """
+
+    def __init__(self, processes):
+        self.processes = processes
+        self.cpu = 0  # id of the process currently running on the CPU (-1 when idle)
+        processes[0].scheduleOnCPU()
+        self.queue = deque(range(1, len(processes)))
+        self.total_time = 0
+        self.cpu_time = 0
+        self.done = 0  # No of processes done
+        self.n = len(processes)
+
+    def processReady(self, id):
+        self.queue.append(id)
+
+    def processDone(self, id):
+        assert (self.cpu == id)
+        self.done += 1
+        self.cpu = -1
+
+    def processIO(self, id):
+        assert (self.cpu == id)
+        self.cpu = -1
+
+    def simulate(self):
+        if self.cpu == -1 and self.queue:
+            self.cpu = self.queue.popleft()
+            self.processes[self.cpu].scheduleOnCPU()
+        if self.cpu >= 0:
+            self.cpu_time += 1
+        self.total_time += 1
+
+        for p in self.processes:
+            p.simulate()
+
+        return self.done == self.n
+
+
+class RRQueue:
+    """
+    RR queue of the MLFQ scheduler, simulated one time unit at a time. It walks the
+    processes in queue order looking for a ready one on every reschedule, with no
+    bookkeeping of which processes are ready.
+    """
+
+    def __init__(self, queue, quantum, isActive):
+        self.quantum = quantum
+        self.queue = queue
+        self.time = 0  # time elapsed on the current burst
+        self.idx = 0
+        self.isActive = isActive
+        self.lastRemoved = -1
+        self.currentRunning = self.queue[0].id if self.queue and self.isActive else -1
+
+    def nextReadyProcess(self):
+        if not self.isActive:
+            return
+        cnt = 0
+        while self.queue[self.idx].mode != READY:
+            self.idx = (self.idx + 1) % len(self.queue)
+            cnt += 1
+            if cnt == len(self.queue):  # all processes are waiting
+                self.makeInactive()
+                return
+        self.currentRunning = self.queue[self.idx].id
+
+    def processIO(self, id):
+        assert (self.currentRunning == id)
+        self.time = 0
+        self.nextReadyProcess()
+
+    def processDone(self, id):
+        assert (self.currentRunning == id)
+        self.time = 0
+        self.removeCurrent()
+        self.nextReadyProcess()
+
+    def removeCurrent(self):
+        del self.queue[self.idx]
+        if self.idx == len(self.queue):
+            self.idx = 0
+        if not self.queue:
+            self.makeInactive()
+
+    def makeInactive(self):
+        self.currentRunning = -1
+        self.isActive = False
+
+    def makeActive(self):
+        if not self.queue:
+            return False
+        if self.isActive:
+            return True
+        self.isActive = True
+        self.nextReadyProcess()
+        return self.isActive
+
+    def addProcess(self, proc):
+        self.queue.append(proc)
+
+    def simulate(self):
+        if not self.isActive:
+            return True
+        self.time += 1
+        if self.time == self.quantum:  # quantum expired
+            self.time = 0
+            self.lastRemoved = self.queue[self.idx].id
+            self.removeCurrent()
+            self.nextReadyProcess()
+            return False
+        return True
+
+
+class MLFQScheduler:
+    """
+    MLFQ scheduler simulated one time unit at a time, with one RR queue per quantum and
+    a last FCFS queue.
+    """
+
+    def __init__(self, processes, quantums):
+        self.processes = processes
+        self.n = len(processes)
+        self.rr_queues = [RRQueue(list(processes) if i == 0 else [], quantum, i == 0)
+                          for i, quantum in enumerate(quantums)]
+        self.fcfs_queue = deque()
+        self.fcfs_priority = len(self.rr_queues)
+        self.priorities = [0] * self.n
+        self.cpu = 0  # id of the process currently running on the CPU (-1 when idle)
+        processes[0].scheduleOnCPU()
+        self.total_time = 0
+        self.cpu_time = 0
+        self.done = 0  # No of processes done
+
+    def processReady(self, id):
+        if self.priorities[id] == self.fcfs_priority:
+            self.fcfs_queue.append(id)
+
+    def processDone(self, id):
+        assert (self.cpu == id)
+        self.done += 1
+        self.cpu = -1
+        if self.priorities[id] < self.fcfs_priority:
+            self.rr_queues[self.priorities[id]].processDone(id)
+
+    def processIO(self, id):
+        assert (self.cpu == id)
+        self.cpu = -1
+        if self.priorities[id] < self.fcfs_priority:
+            self.rr_queues[self.priorities[id]].processIO(id)
+
+    def simulate(self):
+        priorities = self.priorities
+        for prio, q in enumerate(self.rr_queues):
+            if self.cpu == -1 or priorities[self.cpu] > prio:
+                if q.makeActive():
+                    if self.cpu >= 0:
+                        self.processes[self.cpu].descheduleFromCPU()
+                        if priorities[self.cpu] < self.fcfs_priority:
+                            self.rr_queues[priorities[self.cpu]].makeInactive()
+                        else:
+                            self.fcfs_queue.append(self.cpu)
+                    self.cpu = q.currentRunning
+                    self.processes[self.cpu].scheduleOnCPU()
+
+        if self.cpu == -1 and self.fcfs_queue:
+            self.cpu = self.fcfs_queue.popleft()
+            self.processes[self.cpu].scheduleOnCPU()
+
+        if self.cpu >= 0:
+            self.cpu_time += 1
+        self.total_time += 1
+
+        for p in self.processes:
+            p.simulate()
+
+        for prio, q in enumerate(self.rr_queues):
+            if not q.simulate():
+                removed = q.lastRemoved
+                priorities[removed] += 1
+                self.processes[removed].descheduleFromCPU()
+                if prio + 1 < self.fcfs_priority:
+                    self.rr_queues[prio + 1].addProcess(self.processes[removed])
+                else:
+                    self.fcfs_queue.append(removed)
+                self.cpu = -1
+
+        return self.done == self.n
+
+
+"""
+Runs a scheduler to completion and returns its stats as
+(cpu_time, total_time, waiting_times, turnaround_times, response_times).
+Fails if it takes more than max_steps calls to simulate, which is how a stalled queue shows.
+"""
+
+
+def run(scheduler, waiting_times, turnaround_times, response_times, max_steps):
+    step = scheduler.simulate
+    steps = 1
+    while not step():
+        steps += 1
+        assert (steps <= max_steps), "scheduler stalled"
+    return (scheduler.cpu_time, scheduler.total_time,
+            list(waiting_times()), list(turnaround_times()), list(response_times()))
+
+
+"""
+Simulates the given processes with the one-time-unit reference scheduler. Returns its
+stats, or None if it trips one of its own assertions (MLFQ can, when a burst ends on
+the same time unit as its quantum) since there is then nothing to compare against.
+"""
+
+
+def simulateReference(process_times, quantums=None):
+    processes = [Process(i, times, None) for i, times in enumerate(process_times)]
+    if quantums is None:
+        scheduler = FCFSScheduler(processes)
+    else:
+        scheduler = MLFQScheduler(processes, quantums)
+    for p in processes:
+        p.scheduler = scheduler
+    try:
+        return run(scheduler,
+                   lambda: [p.waiting_time for p in processes],
+                   lambda: [p.turnaround_time for p in processes],
+                   lambda: [p.response_time for p in processes],
+                   float("inf"))
+    except AssertionError:
+        return None
+
+
+"""
+Simulates the given processes with the event-driven FCFSScheduler, or MLFQScheduler
+if quantums are given, and returns its stats. Every event is at least one time unit
+apart, so it may take at most max_steps (the reference's total time) calls to simulate.
+"""
+
+
+def simulate(process_times, quantums=None, jit=False, max_steps=float("inf")):
+    state = ProcessState(process_times, jit=jit)
+    if quantums is None:
+        scheduler = FCFS.FCFSScheduler(state)
+    else:
+        scheduler = MLFQ.MLFQScheduler(state, quantums)
+    return run(scheduler,
+               lambda: state.waiting_time,
+               lambda: state.turnaround_time,
+               lambda: state.response_time,
+               max_steps)
+
+
+"""
+Returns a random list of process times: up to 12 processes of up to 9 bursts each,
+with bursts and I/Os of 1 to 25 time units.
+"""
+
+
+def randomProcessTimes(rng):
+    return [[rng.randint(1, 25) for _ in range(2 * rng.randint(0, 8) + 1)]
+            for _ in range(rng.randint(1, 12))]
+
+
+"""
+Checks the event-driven FCFS and MLFQ schedulers against the one-time-unit reference
+on random processes (and random MLFQ quantums), with the Numba kernel too if Numba is
+installed. The seed can be given as the first argument.
+"""
+
+
+def main():
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    runs = 500
+    rng = random.Random(seed)
+    jits = [False, True] if importlib.util.find_spec("numba") else [False]
+
+    checked = skipped = 0
+    for _ in range(runs):
+        process_times = randomProcessTimes(rng)
+        quantums = tuple(rng.randint(1, 12) for _ in range(rng.randint(1, 3)))
+        for q in (None, (5, 10), quantums):
+            expected = simulateReference(process_times, q)
+            if expected is None:
+                skipped += 1
+                continue
+            for jit in jits:
+                result = simulate(process_times, q, jit, expected[1])
+                assert (result == expected), (process_times, q, jit)
+            checked += 1
+
+    print(f"Seed {seed}: {checked} simulations match the reference ({skipped} skipped)")
+
+
+if __name__ == '__main__':
+    main()
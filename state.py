@@ -0,0 +1,206 @@
+import numpy as np
+
+# Process modes
+READY = 0  # waiting to be scheduled on the CPU
+BURST = 1  # running on the CPU
+IO = 2  # waiting for I/O
+DONE = 3  # finished running
+
+NO_LIMIT = np.iinfo(np.int64).max  # tick limit when only bursts and I/Os bound the next event
+
+
+class ProcessState:
+    """
+    Holds the state of all processes as lists indexed by process id.
+    burst_times and io_times have one row per process; idx_burst and idx_io are the
+    indices of the current burst and I/O time.
+    remaining is the time left in the current burst or I/O (or the next burst, for a ready
+    process); it is reloaded from burst_times or io_times whenever the process changes mode.
+    waiting_time is the total time each process has spent waiting
+    turnaround_time is the total time each process has spent running
+    response_time is the time each process first started running (-1 until then)
+    mode holds one of READY, BURST, IO or DONE for each process.
+    With jit=True the state is held in NumPy arrays instead (burst_times and io_times
+    padded with zeros to the longest process) and tick is compiled with Numba, which is
+    only imported then. Compiling, or loading the cached kernel, costs far more than it
+    saves on a single run, so this only pays off for many or very large simulations.
+    """
+
+    def __init__(self, process_times, jit=False):
+        self.n = len(process_times)
+        self.jit = jit
+        self.num_bursts = [len(times[::2]) for times in process_times]
+        self.burst_times = [list(times[::2]) for times in process_times]
+        self.io_times = [list(times[1::2]) for times in process_times]
+
+        self.mode = [READY] * self.n
+        self.idx_burst = [0] * self.n
+        self.idx_io = [0] * self.n
+        self.remaining = [times[0] for times in self.burst_times]
+
+        self.waiting_time = [0] * self.n
+        self.turnaround_time = [0] * self.n
+        self.response_time = [-1] * self.n
+        self.finished = [0] * self.n  # ids filled in by tick
+        self.next_mode = [READY] * self.n  # and the modes they move to
+        self.tick = tick
+
+        if jit:
+            burst_times = np.zeros((self.n, max(self.num_bursts)), dtype=np.int32)
+            io_times = np.zeros((self.n, max(len(times) for times in self.io_times)), dtype=np.int32)
+            for i in range(self.n):
+                burst_times[i, :self.num_bursts[i]] = self.burst_times[i]
+                io_times[i, :len(self.io_times[i])] = self.io_times[i]
+            self.burst_times = burst_times
+            self.io_times = io_times
+            self.num_bursts = np.array(self.num_bursts, dtype=np.int32)
+            self.mode = np.array(self.mode, dtype=np.int8)
+            self.idx_burst = np.array(self.idx_burst, dtype=np.int32)
+            self.idx_io = np.array(self.idx_io, dtype=np.int32)
+            self.remaining = np.array(self.remaining, dtype=np.int32)
+            self.waiting_time = np.array(self.waiting_time, dtype=np.int64)
+            self.turnaround_time = np.array(self.turnaround_time, dtype=np.int64)
+            self.response_time = np.array(self.response_time, dtype=np.int64)
+            self.finished = np.array(self.finished, dtype=np.int64)
+            self.next_mode = np.array(self.next_mode, dtype=np.int8)
+            self.tick = compiledTick()
+
+    """
+    Advances every process to the next event, or by limit time units if that is earlier
+    (see tick). Returns the time advanced and the number of processes whose burst or
+    I/O ran out, to be passed to update.
+    """
+
+    def advance(self, limit):
+        return self.tick(self.mode, self.remaining, self.waiting_time, self.turnaround_time,
+                         self.idx_burst, self.idx_io, self.num_bursts, self.burst_times, self.io_times,
+                         self.finished, self.next_mode, limit)
+
+    """
+    Called after advance, with the number of processes whose burst or I/O ran out on the
+    last time unit. Moves each of them to its next mode, in order of id, and notifies the
+    scheduler through its processDone, processIO and processReady functions.
+    """
+
+    def update(self, sched, count):
+        if count == 0:  # the event was the scheduler's own (a quantum expiring)
+            return
+        mode = self.mode
+        finished = self.finished[:count]
+        next_mode = self.next_mode[:count]
+        if self.jit:
+            finished = finished.tolist()
+            next_mode = next_mode.tolist()
+        for i, m in zip(finished, next_mode):
+            mode[i] = m
+            if m == DONE:
+                sched.processDone(i)
+            elif m == IO:
+                sched.processIO(i)
+            else:
+                sched.processReady(i)
+
+    """
+    This function updates the mode of process id to BURST.
+    """
+
+    def scheduleOnCPU(self, id):
+        assert (self.mode[id] == READY)
+        self.mode[id] = BURST
+        if self.response_time[id] < 0:
+            self.response_time[id] = self.turnaround_time[id]
+
+    """
+    This function updates the mode of process id to READY.
+    """
+
+    def descheduleFromCPU(self, id):
+        assert (self.mode[id] == BURST)
+        self.mode[id] = READY
+
+
+class Process:
+    """
+    A read-only view of one process in a ProcessState, used to print its stats.
+    """
+
+    def __init__(self, id, state):
+        self.id = id
+        self.state = state
+
+    @property
+    def waiting_time(self):
+        return self.state.waiting_time[self.id]
+
+    @property
+    def turnaround_time(self):
+        return self.state.turnaround_time[self.id]
+
+    @property
+    def response_time(self):
+        return self.state.response_time[self.id]
+
+
+"""
+Advances every process to the next event. dt is the time left until the first burst
+or I/O finishes, or limit if that comes earlier (the scheduler's own next event).
+Running processes and processes doing I/O spend dt of their remaining time and ready
+processes wait dt longer. Nothing changes mode in between, so the simulation can jump
+straight there. The ids of the processes whose burst or I/O reaches zero are written,
+in order, to finished, and the modes they move to to next_mode; their next burst or
+I/O is loaded into remaining. Their mode itself is left to ProcessState.update, since
+the scheduler must see the processes change mode one at a time, in order of id.
+Returns dt and the number of finished processes. The same code runs on the lists of
+a ProcessState, as plain Python, and on its arrays when compiled by compiledTick.
+"""
+
+
+def tick(mode, remaining, waiting_time, turnaround_time, idx_burst, idx_io, num_bursts, burst_times, io_times,
+         finished, next_mode, limit):
+    # Plain loops with no temporaries: boolean masks would allocate on every call
+    dt = limit
+    for i in range(len(mode)):
+        if (mode[i] == BURST or mode[i] == IO) and remaining[i] < dt:
+            dt = remaining[i]
+
+    count = 0
+    for i in range(len(mode)):
+        m = mode[i]
+        if m == DONE:
+            continue
+        turnaround_time[i] += dt
+        if m == READY:
+            waiting_time[i] += dt
+        else:
+            remaining[i] -= dt
+            if remaining[i] == 0:
+                finished[count] = i
+                if m == BURST:
+                    idx_burst[i] += 1
+                    if idx_burst[i] == num_bursts[i]:
+                        next_mode[count] = DONE
+                    else:
+                        next_mode[count] = IO
+                        remaining[i] = io_times[i][idx_io[i]]
+                else:
+                    next_mode[count] = READY
+                    idx_io[i] += 1
+                    remaining[i] = burst_times[i][idx_burst[i]]
+                count += 1
+    return dt, count
+
+
+_compiled_tick = None
+
+"""
+Returns tick compiled with Numba, importing Numba and compiling (or loading from the
+cache) on the first call only.
+"""
+
+
+def compiledTick():
+    global _compiled_tick
+    if _compiled_tick is None:
+        from numba import njit
+        _compiled_tick = njit(cache=True)(tick)
+    return _compiled_tick